@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Sequence
+
+
+ROOT = Path(__file__).resolve().parents[1]
+MANIFEST_PATH = ROOT / "assets" / ".asset-build-manifest.json"
+SHARED_SOURCES = (Path(__file__).resolve(), Path(__file__).resolve().parent / "gif_encoder.py")
+
+
+@dataclass(frozen=True)
+class Target:
+    name: str
+    build: Callable[[], None]
+    outputs: tuple[Path, ...]
+    inputs: tuple[Path, ...]
+    # Layout constants and other values that change the output without touching an input file.
+    params: Any = None
+    sources: tuple[Path, ...] = field(default_factory=tuple)
+
+
+def file_digest(path: Path) -> str:
+    if not path.exists():
+        return "missing"
+    digest = hashlib.sha256()
+    with open(path, "rb") as fp:
+        for chunk in iter(lambda: fp.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def relative(path: Path) -> str:
+    try:
+        return path.resolve().relative_to(ROOT).as_posix()
+    except ValueError:
+        return str(path)
+
+
+def input_hash(target: Target) -> str:
+    digest = hashlib.sha256()
+    for path in sorted({*target.inputs, *target.sources, *SHARED_SOURCES}, key=str):
+        digest.update(f"{relative(path)}={file_digest(path)}\n".encode("utf-8"))
+    digest.update(repr(target.params).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def load_manifest() -> dict[str, Any]:
+    try:
+        return json.loads(MANIFEST_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def is_fresh(target: Target, entry: dict[str, Any] | None, digest: str) -> bool:
+    if not entry or entry.get("inputs") != digest:
+        return False
+    recorded = entry.get("outputs", {})
+    return all(recorded.get(relative(path)) == file_digest(path) for path in target.outputs)
+
+
+def timed_build(build: Callable[[], None]) -> float:
+    started = time.perf_counter()
+    build()
+    return time.perf_counter() - started
+
+
+def run_targets(targets: Sequence[Target], *, force: bool = False, workers: int | None = None) -> None:
+    manifest = load_manifest()
+    digests = {target.name: input_hash(target) for target in targets}
+    stale = [target for target in targets if force or not is_fresh(target, manifest.get(target.name), digests[target.name])]
+    for target in targets:
+        if target not in stale:
+            print(f"[assets] {target.name}: up to date")
+
+    started = time.perf_counter()
+    timings: dict[str, float] = {}
+    failures: list[tuple[Target, BaseException]] = []
+    if len(stale) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers or len(stale), len(stale))) as pool:
+            futures = {pool.submit(timed_build, target.build): target for target in stale}
+            for future in as_completed(futures):
+                try:
+                    timings[futures[future].name] = future.result()
+                except Exception as exc:
+                    failures.append((futures[future], exc))
+    else:
+        for target in stale:
+            try:
+                timings[target.name] = timed_build(target.build)
+            except Exception as exc:
+                failures.append((target, exc))
+
+    # Targets that did build are recorded even if another one failed, so the next run only retries the failures.
+    for target in stale:
+        if target.name not in timings:
+            manifest.pop(target.name, None)
+            continue
+        manifest[target.name] = {
+            "inputs": digests[target.name],
+            "outputs": {relative(path): file_digest(path) for path in target.outputs},
+        }
+        outputs = ", ".join(relative(path) for path in target.outputs)
+        print(f"[assets] {target.name}: rebuilt in {timings[target.name]:.2f}s -> {outputs}")
+
+    if stale:
+        MANIFEST_PATH.parent.mkdir(parents=True, exist_ok=True)
+        MANIFEST_PATH.write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    print(f"[assets] {len(timings)}/{len(targets)} targets rebuilt in {time.perf_counter() - started:.2f}s")
+    for target, exc in failures:
+        print(f"[assets] {target.name}: FAILED: {exc!r}")
+    if failures:
+        raise failures[0][1]
+
+
+def main_for(targets: Sequence[Target], description: str) -> None:
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--force", action="store_true", help="rebuild every target even if its inputs are unchanged")
+    parser.add_argument("--workers", type=int, default=None, help="parallel target builds (default: one per stale target)")
+    args = parser.parse_args()
+    run_targets(targets, force=args.force, workers=args.workers)
+
+
+def all_targets() -> list[Target]:
+    import generate_marketing_assets
+    import generate_readme_gif
+
+    return [*generate_marketing_assets.TARGETS, *generate_readme_gif.TARGETS]
+
+
+if __name__ == "__main__":
+    main_for(all_targets(), "Incrementally rebuild every generated README/marketing asset")
@@ -1,10 +1,16 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
+import shutil
+from functools import lru_cache
 from pathlib import Path
 
+import numpy as np
 from PIL import Image, ImageChops, ImageDraw, ImageFilter, ImageFont, ImageOps
 
+from asset_build import Target, main_for
+from gif_encoder import encode_gif, pool_map
+
 
 ROOT = Path(__file__).resolve().parents[1]
 ASSETS_DIR = ROOT / "assets"
@@ -17,32 +23,42 @@ GIF_PATH = SCREENSHOT_DIR / "demo-live-roundtrip.gif"
 HERO_PATH = MARKETING_DIR / "github-hero.png"
 RELEASE_COVER_PATH = MARKETING_DIR / "release-cover.png"
 
-
+# The background is only gradients and heavily blurred glows, so it is rendered at 1/4 scale and upsampled.
+BACKGROUND_SCALE = 4
+GRADIENT_TOP = (9, 17, 31)
+GRADIENT_BOTTOM = (22, 39, 56)
+GLOWS = [
+    ((-140, -80, 620, 580), (29, 190, 182, 120)),
+    ((980, 40, 1600, 760), (245, 158, 11, 110)),
+    ((720, 420, 1320, 980), (59, 130, 246, 110)),
+]
+GLOW_BLUR = 90
+
+
+MONO_FONTS = (
+    "/System/Library/Fonts/Supplemental/Andale Mono.ttf",
+    "/System/Library/Fonts/Supplemental/Courier New.ttf",
+)
+CHINESE_FONTS = (
+    "/System/Library/Fonts/Supplemental/Arial Unicode.ttf",
+    "/System/Library/Fonts/Supplemental/PingFang.ttc",
+    "/System/Library/Fonts/Supplemental/Heiti SC.ttc",
+)
+DISPLAY_FONTS = (
+    "/System/Library/Fonts/Supplemental/Futura.ttc",
+    "/System/Library/Fonts/Supplemental/AmericanTypewriter.ttc",
+    "/System/Library/Fonts/Supplemental/Arial Bold.ttf",
+)
+
+
+@lru_cache(maxsize=None)
 def font(size: int, *, mono: bool = False, chinese: bool = False) -> ImageFont.FreeTypeFont | ImageFont.ImageFont:
-    candidates = []
     if mono:
-        candidates.extend(
-            [
-                "/System/Library/Fonts/Supplemental/Andale Mono.ttf",
-                "/System/Library/Fonts/Supplemental/Courier New.ttf",
-            ]
-        )
+        candidates = MONO_FONTS
     elif chinese:
-        candidates.extend(
-            [
-                "/System/Library/Fonts/Supplemental/Arial Unicode.ttf",
-                "/System/Library/Fonts/Supplemental/PingFang.ttc",
-                "/System/Library/Fonts/Supplemental/Heiti SC.ttc",
-            ]
-        )
+        candidates = CHINESE_FONTS
     else:
-        candidates.extend(
-            [
-                "/System/Library/Fonts/Supplemental/Futura.ttc",
-                "/System/Library/Fonts/Supplemental/AmericanTypewriter.ttc",
-                "/System/Library/Fonts/Supplemental/Arial Bold.ttf",
-            ]
-        )
+        candidates = DISPLAY_FONTS
 
     for candidate in candidates:
         path = Path(candidate)
@@ -58,12 +74,16 @@ def rounded_mask(size: tuple[int, int], radius: int) -> Image.Image:
     return mask
 
 
-def add_shadow(base: Image.Image, box: tuple[int, int], size: tuple[int, int], radius: int = 28, blur: int = 24, alpha: int = 90) -> None:
+@lru_cache(maxsize=None)
+def shadow_layer(size: tuple[int, int], radius: int, blur: int, alpha: int) -> Image.Image:
     shadow = Image.new("RGBA", size, (0, 0, 0, 0))
     draw = ImageDraw.Draw(shadow)
     draw.rounded_rectangle((0, 0, size[0], size[1]), radius=radius, fill=(15, 23, 42, alpha))
-    shadow = shadow.filter(ImageFilter.GaussianBlur(blur))
-    base.alpha_composite(shadow, (box[0] - blur // 2, box[1] - blur // 2))
+    return shadow.filter(ImageFilter.GaussianBlur(blur))
+
+
+def add_shadow(base: Image.Image, box: tuple[int, int], size: tuple[int, int], radius: int = 28, blur: int = 24, alpha: int = 90) -> None:
+    base.alpha_composite(shadow_layer(size, radius, blur, alpha), (box[0] - blur // 2, box[1] - blur // 2))
 
 
 def fit_cover(img: Image.Image, size: tuple[int, int]) -> Image.Image:
@@ -100,29 +120,29 @@ def draw_chip(draw: ImageDraw.ImageDraw, xy: tuple[int, int], label: str, *, fil
     return width, height
 
 
-def draw_gradient_background(size: tuple[int, int]) -> Image.Image:
+def vertical_gradient(size: tuple[int, int], top: tuple[int, int, int], bottom: tuple[int, int, int]) -> Image.Image:
     width, height = size
-    canvas = Image.new("RGBA", size, "#09111f")
-    draw = ImageDraw.Draw(canvas)
-    for y in range(height):
-        t = y / max(1, height - 1)
-        r = int(9 + (22 - 9) * t)
-        g = int(17 + (39 - 17) * t)
-        b = int(31 + (56 - 31) * t)
-        draw.line((0, y, width, y), fill=(r, g, b, 255))
-
-    glows = [
-        ((-140, -80, 620, 580), (29, 190, 182, 120)),
-        ((980, 40, 1600, 760), (245, 158, 11, 110)),
-        ((720, 420, 1320, 980), (59, 130, 246, 110)),
-    ]
-    for box, color in glows:
-        glow = Image.new("RGBA", size, (0, 0, 0, 0))
-        gdraw = ImageDraw.Draw(glow)
-        gdraw.ellipse(box, fill=color)
-        glow = glow.filter(ImageFilter.GaussianBlur(90))
-        canvas.alpha_composite(glow)
-    return canvas
+    t = np.linspace(0.0, 1.0, height, dtype=np.float32)[:, None]
+    rows = np.asarray(top, dtype=np.float32) + (np.asarray(bottom, dtype=np.float32) - np.asarray(top, dtype=np.float32)) * t
+    pixels = np.broadcast_to(rows.astype(np.uint8)[:, None, :], (height, width, 3))
+    return Image.fromarray(np.ascontiguousarray(pixels), "RGB")
+
+
+@lru_cache(maxsize=None)
+def gradient_background(size: tuple[int, int]) -> Image.Image:
+    scale = BACKGROUND_SCALE
+    small_size = (-(-size[0] // scale), -(-size[1] // scale))
+    canvas = vertical_gradient(small_size, GRADIENT_TOP, GRADIENT_BOTTOM).convert("RGBA")
+    for box, color in GLOWS:
+        glow = Image.new("RGBA", small_size, (0, 0, 0, 0))
+        ImageDraw.Draw(glow).ellipse(tuple(v / scale for v in box), fill=color)
+        canvas.alpha_composite(glow.filter(ImageFilter.GaussianBlur(GLOW_BLUR / scale)))
+    return canvas.resize(size, Image.BICUBIC)
+
+
+def draw_gradient_background(size: tuple[int, int]) -> Image.Image:
+    # Callers draw on the result, so hand out a copy of the cached render.
+    return gradient_background(size).copy()
 
 
 def build_hero() -> Image.Image:
@@ -213,77 +233,79 @@ def compose_demo_frame(screenshot: Image.Image, title: str, subtitle: str) -> Im
     return canvas.convert("RGBA")
 
 
-def blend(a: Image.Image, b: Image.Image, steps: int) -> list[Image.Image]:
-    frames = []
-    for idx in range(1, steps + 1):
-        frames.append(Image.blend(a, b, idx / steps))
-    return frames
+ZH_SUBTITLES = ("Type in Chinese first", "先自然输入中文，再用三连空格切换")
+EN_SUBTITLES = ("Translated in place", "不离开当前输入框，直接替换成英文")
+TRIGGER_LABEL = "Press Space x3 within 0.5s"
+TOGGLE_BACK_LABEL = "Press Space x3 again to toggle back"
+BLEND_STEPS = 5
+
+# (base, spaces pressed, label, blend target, blend amount, duration ms); label None means the bare base frame.
+DEMO_SEQUENCE: list[tuple[str, int, str | None, str | None, float, int]] = [
+    ("zh", 0, "Typing in Chinese", None, 0.0, 900),
+    ("zh", 1, TRIGGER_LABEL, None, 0.0, 220),
+    ("zh", 2, TRIGGER_LABEL, None, 0.0, 220),
+    ("zh", 3, TRIGGER_LABEL, None, 0.0, 500),
+    *[("zh", 3, TRIGGER_LABEL, "en", idx / BLEND_STEPS, 120) for idx in range(1, BLEND_STEPS + 1)],
+    ("en", 0, "Now in English", None, 0.0, 950),
+    ("en", 1, TOGGLE_BACK_LABEL, None, 0.0, 220),
+    ("en", 2, TOGGLE_BACK_LABEL, None, 0.0, 220),
+    ("en", 3, TOGGLE_BACK_LABEL, None, 0.0, 500),
+    *[("en", 3, TOGGLE_BACK_LABEL, "zh", idx / BLEND_STEPS, 120) for idx in range(1, BLEND_STEPS + 1)],
+    ("zh", 0, "Back to Chinese", None, 0.0, 1400),
+]
+
+
+@lru_cache(maxsize=None)
+def demo_base(kind: str) -> Image.Image:
+    if kind == "zh":
+        return compose_demo_frame(Image.open(ZH_INPUT).convert("RGB"), *ZH_SUBTITLES)
+    return compose_demo_frame(Image.open(EN_OUTPUT).convert("RGB"), *EN_SUBTITLES)
+
+
+def render_demo_frame(kind: str, count: int, label: str | None, blend_to: str | None, amount: float) -> Image.Image:
+    # Runs in worker processes; each worker composes the two base frames once.
+    frame = overlay_space_indicator(demo_base(kind), count, label) if label is not None else demo_base(kind)
+    if blend_to is not None:
+        frame = Image.blend(frame, demo_base(blend_to), amount)
+    return frame.convert("RGB")
 
 
 def build_demo_gif() -> None:
-    zh = Image.open(ZH_INPUT).convert("RGB")
-    en = Image.open(EN_OUTPUT).convert("RGB")
-    zh_frame = compose_demo_frame(zh, "Type in Chinese first", "先自然输入中文，再用三连空格切换")
-    en_frame = compose_demo_frame(en, "Translated in place", "不离开当前输入框，直接替换成英文")
-
-    frames: list[Image.Image] = []
-    durations: list[int] = []
-
-    sequence = [
-        (zh_frame, 0, "Typing in Chinese", 900),
-        (zh_frame, 1, "Press Space x3 within 0.5s", 220),
-        (zh_frame, 2, "Press Space x3 within 0.5s", 220),
-        (zh_frame, 3, "Press Space x3 within 0.5s", 500),
-    ]
-    for base, count, label, duration in sequence:
-        frames.append(overlay_space_indicator(base, count, label).convert("P", palette=Image.ADAPTIVE))
-        durations.append(duration)
-
-    for frame in blend(overlay_space_indicator(zh_frame, 3, "Press Space x3 within 0.5s"), en_frame, 5):
-        frames.append(frame.convert("P", palette=Image.ADAPTIVE))
-        durations.append(120)
-
-    frames.append(overlay_space_indicator(en_frame, 0, "Now in English").convert("P", palette=Image.ADAPTIVE))
-    durations.append(950)
-
-    sequence_back = [
-        (en_frame, 1, "Press Space x3 again to toggle back", 220),
-        (en_frame, 2, "Press Space x3 again to toggle back", 220),
-        (en_frame, 3, "Press Space x3 again to toggle back", 500),
-    ]
-    for base, count, label, duration in sequence_back:
-        frames.append(overlay_space_indicator(base, count, label).convert("P", palette=Image.ADAPTIVE))
-        durations.append(duration)
-
-    for frame in blend(overlay_space_indicator(en_frame, 3, "Press Space x3 again to toggle back"), zh_frame, 5):
-        frames.append(frame.convert("P", palette=Image.ADAPTIVE))
-        durations.append(120)
-
-    frames.append(overlay_space_indicator(zh_frame, 0, "Back to Chinese").convert("P", palette=Image.ADAPTIVE))
-    durations.append(1400)
-
-    GIF_PATH.parent.mkdir(parents=True, exist_ok=True)
-    frames[0].save(
-        GIF_PATH,
-        save_all=True,
-        append_images=frames[1:],
-        duration=durations,
-        loop=0,
-        optimize=True,
-        disposal=2,
-    )
-
-
-def main() -> None:
+    specs = [spec[:5] for spec in DEMO_SEQUENCE]
+    frames = pool_map(render_demo_frame, *zip(*specs))
+    durations = [spec[5] for spec in DEMO_SEQUENCE]
+    encode_gif(GIF_PATH, frames, durations)
+
+
+def build_hero_assets() -> None:
     MARKETING_DIR.mkdir(parents=True, exist_ok=True)
-    hero = build_hero()
-    hero.save(HERO_PATH, quality=95)
-    hero.save(RELEASE_COVER_PATH, quality=95)
-    build_demo_gif()
-    print(f"Generated {HERO_PATH}")
-    print(f"Generated {RELEASE_COVER_PATH}")
-    print(f"Generated {GIF_PATH}")
+    build_hero().save(HERO_PATH, quality=95)
+    # The release cover is the same image; copy the encoded file instead of encoding it twice.
+    shutil.copyfile(HERO_PATH, RELEASE_COVER_PATH)
+
+
+FONT_INPUTS = tuple(Path(candidate) for candidate in (*MONO_FONTS, *CHINESE_FONTS, *DISPLAY_FONTS))
+SCRIPT_SOURCES = (Path(__file__).resolve(),)
+
+TARGETS = [
+    Target(
+        name="marketing-hero",
+        build=build_hero_assets,
+        outputs=(HERO_PATH, RELEASE_COVER_PATH),
+        inputs=(ICON_PATH, ZH_INPUT, EN_OUTPUT, *FONT_INPUTS),
+        params=(BACKGROUND_SCALE, GRADIENT_TOP, GRADIENT_BOTTOM, GLOWS, GLOW_BLUR),
+        sources=SCRIPT_SOURCES,
+    ),
+    Target(
+        name="demo-live-gif",
+        build=build_demo_gif,
+        outputs=(GIF_PATH,),
+        inputs=(ZH_INPUT, EN_OUTPUT, *FONT_INPUTS),
+        params=(BACKGROUND_SCALE, GRADIENT_TOP, GRADIENT_BOTTOM, GLOWS, GLOW_BLUR, DEMO_SEQUENCE),
+        sources=SCRIPT_SOURCES,
+    ),
+]
 
 
 if __name__ == "__main__":
-    main()
+    main_for(TARGETS, "Generate the GitHub hero, release cover and live demo GIF")
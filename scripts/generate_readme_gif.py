@@ -1,10 +1,14 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
+from functools import lru_cache
 from pathlib import Path
 
 from PIL import Image, ImageDraw, ImageFont
 
+from asset_build import Target, main_for
+from gif_encoder import encode_gif, pool_map
+
 
 ROOT = Path(__file__).resolve().parents[1]
 SCREENSHOT_DIR = ROOT / "assets" / "screenshots"
@@ -27,15 +31,16 @@ HEADER_BG = "#111827"
 CAPTION_BG = "#E9EEF7"
 TEXT_DARK = "#111827"
 TEXT_LIGHT = "#F9FAFB"
+FONT_CANDIDATES = (
+    "/System/Library/Fonts/Supplemental/Helvetica.ttc",
+    "/System/Library/Fonts/Supplemental/Arial Unicode.ttf",
+    "/System/Library/Fonts/Supplemental/Arial.ttf",
+)
 
 
+@lru_cache(maxsize=None)
 def load_font(size: int) -> ImageFont.ImageFont:
-    candidates = [
-        "/System/Library/Fonts/Supplemental/Helvetica.ttc",
-        "/System/Library/Fonts/Supplemental/Arial Unicode.ttf",
-        "/System/Library/Fonts/Supplemental/Arial.ttf",
-    ]
-    for candidate in candidates:
+    for candidate in FONT_CANDIDATES:
         path = Path(candidate)
         if path.exists():
             return ImageFont.truetype(str(path), size=size)
@@ -48,10 +53,18 @@ def fit_image(img: Image.Image, width: int) -> Image.Image:
     return img.resize((width, height), Image.LANCZOS)
 
 
-def render_frame(source_path: Path, caption: str, header_font, caption_font) -> Image.Image:
+def fitted_height(source_path: Path) -> int:
+    with Image.open(source_path) as screenshot:
+        return max(1, int(screenshot.height * (CANVAS_WIDTH / screenshot.width)))
+
+
+def render_frame(source_path: Path, caption: str, body_height: int) -> Image.Image:
+    # Every frame shares one canvas size so the GIF can be delta-encoded; shorter screenshots sit on CANVAS_BG.
+    header_font = load_font(30)
+    caption_font = load_font(24)
     screenshot = Image.open(source_path).convert("RGB")
     fitted = fit_image(screenshot, CANVAS_WIDTH)
-    canvas_height = HEADER_HEIGHT + fitted.height + CAPTION_HEIGHT
+    canvas_height = HEADER_HEIGHT + body_height + CAPTION_HEIGHT
     canvas = Image.new("RGB", (CANVAS_WIDTH, canvas_height), CANVAS_BG)
     draw = ImageDraw.Draw(canvas)
 
@@ -68,27 +81,25 @@ def render_frame(source_path: Path, caption: str, header_font, caption_font) ->
     return canvas
 
 
-def main() -> None:
-    header_font = load_font(30)
-    caption_font = load_font(24)
+def build_readme_gif() -> None:
+    sources = [SCREENSHOT_DIR / image_name for image_name, _ in FRAMES]
+    captions = [caption for _, caption in FRAMES]
+    body_height = max(fitted_height(source) for source in set(sources))
+    frames = pool_map(render_frame, sources, captions, [body_height] * len(sources))
+    encode_gif(OUTPUT_PATH, frames, DURATIONS)
 
-    frames = []
-    for image_name, caption in FRAMES:
-        source = SCREENSHOT_DIR / image_name
-        frames.append(render_frame(source, caption, header_font, caption_font))
 
-    OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-    frames[0].save(
-        OUTPUT_PATH,
-        save_all=True,
-        append_images=frames[1:],
-        duration=DURATIONS,
-        loop=0,
-        optimize=True,
-        disposal=2,
-    )
-    print(f"Generated {OUTPUT_PATH}")
+TARGETS = [
+    Target(
+        name="readme-gif",
+        build=build_readme_gif,
+        outputs=(OUTPUT_PATH,),
+        inputs=(*(SCREENSHOT_DIR / image_name for image_name, _ in FRAMES), *(Path(c) for c in FONT_CANDIDATES)),
+        params=(FRAMES, DURATIONS, CANVAS_WIDTH, HEADER_HEIGHT, CAPTION_HEIGHT, CANVAS_BG, HEADER_BG, CAPTION_BG, TEXT_DARK, TEXT_LIGHT),
+        sources=(Path(__file__).resolve(),),
+    ),
+]
 
 
 if __name__ == "__main__":
-    main()
+    main_for(TARGETS, "Generate the README round-trip demo GIF")
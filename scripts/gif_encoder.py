@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from pathlib import Path
+from typing import Any, Callable, Sequence
+
+import numpy as np
+from PIL import GifImagePlugin, Image
+
+
+# Palette index reserved for "unchanged since previous frame"; real colors use 0..254.
+TRANSPARENT_INDEX = 255
+PALETTE_COLORS = 255
+# Palette is trained on frames downsampled by this factor (nearest, so no new colors are invented).
+PALETTE_SAMPLE_STEP = 4
+
+
+def pool_map(fn: Callable[..., Any], *iterables: Sequence[Any], workers: int | None = None) -> list[Any]:
+    items = [list(it) for it in iterables]
+    count = len(items[0]) if items else 0
+    workers = min(workers or os.cpu_count() or 1, count)
+    if workers <= 1:
+        return [fn(*args) for args in zip(*items)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(fn, *items))
+
+
+def build_global_palette(frames: Sequence[Image.Image], colors: int = PALETTE_COLORS) -> Image.Image:
+    samples = [np.asarray(frame.convert("RGB"))[::PALETTE_SAMPLE_STEP, ::PALETTE_SAMPLE_STEP] for frame in frames]
+    montage = Image.fromarray(np.concatenate(samples, axis=0), "RGB")
+    quantized = montage.quantize(colors=colors, method=Image.Quantize.FASTOCTREE)
+    palette = quantized.getpalette()[: colors * 3]
+    palette += palette[:3] * (256 - len(palette) // 3)
+    palette_image = Image.new("P", (1, 1))
+    palette_image.putpalette(palette)
+    return palette_image
+
+
+def quantize_frame(frame: Image.Image, palette: Image.Image) -> np.ndarray:
+    indices = np.array(frame.convert("RGB").quantize(palette=palette, dither=Image.Dither.NONE))
+    # Padding entries duplicate color 0; keep the transparent slot free for delta frames.
+    indices[indices >= PALETTE_COLORS] = 0
+    return indices
+
+
+def delta_frames(
+    indices: Sequence[np.ndarray], durations: Sequence[int]
+) -> tuple[list[tuple[tuple[int, int], np.ndarray]], list[int]]:
+    # Each later frame is cropped to the box of pixels that differ from the previous frame and returned with its
+    # (x, y) offset; unchanged pixels inside the box become transparent so LZW sees long runs.
+    # Identical frames are folded into the previous frame's duration.
+    frames: list[tuple[tuple[int, int], np.ndarray]] = [((0, 0), indices[0])]
+    merged: list[int] = [durations[0]]
+    previous = indices[0]
+    for current, duration in zip(indices[1:], durations[1:]):
+        changed = current != previous
+        rows = np.flatnonzero(changed.any(axis=1))
+        if not rows.size:
+            merged[-1] += duration
+            continue
+        cols = np.flatnonzero(changed.any(axis=0))
+        box = (slice(rows[0], rows[-1] + 1), slice(cols[0], cols[-1] + 1))
+        frames.append(((int(cols[0]), int(rows[0])), np.where(changed[box], current[box], TRANSPARENT_INDEX).astype(np.uint8)))
+        merged.append(duration)
+        previous = current
+    return frames, merged
+
+
+def encode_gif(path: Path, frames: Sequence[Image.Image], durations: Sequence[int], *, loop: int = 0, workers: int | None = None) -> None:
+    if len({frame.size for frame in frames}) != 1:
+        raise ValueError(f"GIF frames must share one size, got {sorted({frame.size for frame in frames})}")
+    palette = build_global_palette(frames)
+    indices = pool_map(quantize_frame, frames, repeat(palette, len(frames)), workers=workers)
+    deltas, merged_durations = delta_frames(indices, durations)
+
+    # Pillow's save_all re-diffs frames without offsets, so the stream is assembled from its per-frame encoder.
+    canvas = Image.fromarray(deltas[0][1], "P")
+    canvas.putpalette(palette.getpalette())
+    header, _ = GifImagePlugin.getheader(canvas, None, {"loop": loop})
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as fp:
+        fp.write(b"".join(header))
+        for idx, ((offset, data), duration) in enumerate(zip(deltas, merged_durations)):
+            params: dict[str, Any] = {"duration": duration, "disposal": 1}
+            if idx:
+                params["transparency"] = TRANSPARENT_INDEX
+            fp.write(b"".join(GifImagePlugin.getdata(Image.fromarray(data, "P"), offset, **params)))
+        fp.write(b";")
@@ -1,10 +1,14 @@
 using System.Diagnostics;
 using System.Text;
+using System.Text.RegularExpressions;
 
 namespace TripleSpaceTranslator.Win.Services.Translation;
 
 public sealed class OfflineModelTranslator : ITranslator
 {
+    // Codes are passed to translate_once.py on its command line; only plain ISO 639 codes are accepted.
+    private static readonly Regex LanguageCodeRegex = new("^[a-z]{2,3}$", RegexOptions.Compiled);
+
     public async Task<string> TranslateAsync(string text, string sourceLang, string targetLang, CancellationToken cancellationToken)
     {
         var pythonExe = ResolvePythonExecutablePath();
@@ -29,15 +33,20 @@ public sealed class OfflineModelTranslator : ITranslator
         Directory.CreateDirectory(offlineHome);
         Directory.CreateDirectory(userSitePackages);
 
-        if (!IsSupportedPair(source, target))
+        if (string.IsNullOrEmpty(source) || string.IsNullOrEmpty(target) || source == target)
         {
-            throw new InvalidOperationException($"Offline model only supports zh<->en currently. Requested: {source}->{target}");
+            // Pair availability (direct or via English pivot) is resolved by translate_once.py from installed packages.
+            throw new InvalidOperationException($"Offline model requires two different languages. Requested: {source}->{target}");
+        }
+
+        if (!LanguageCodeRegex.IsMatch(source) || !LanguageCodeRegex.IsMatch(target))
+        {
+            throw new InvalidOperationException($"Offline model requires ISO 639 language codes. Requested: {sourceLang}->{targetLang}");
         }
 
         var startInfo = new ProcessStartInfo
         {
             FileName = pythonExe,
-            Arguments = $"\"{scriptPath}\" --source {source} --target {target}",
             RedirectStandardInput = true,
             RedirectStandardOutput = true,
             RedirectStandardError = true,
@@ -46,6 +55,10 @@ public sealed class OfflineModelTranslator : ITranslator
             StandardOutputEncoding = Encoding.UTF8,
             StandardErrorEncoding = Encoding.UTF8
         };
+        foreach (var argument in new[] { scriptPath, "--source", source, "--target", target })
+        {
+            startInfo.ArgumentList.Add(argument);
+        }
         startInfo.EnvironmentVariables["PYTHONUTF8"] = "1";
         startInfo.EnvironmentVariables["PYTHONNOUSERSITE"] = "1";
         startInfo.EnvironmentVariables["HOME"] = offlineHome;
@@ -112,11 +125,6 @@ public sealed class OfflineModelTranslator : ITranslator
         return stdout;
     }
 
-    private static bool IsSupportedPair(string source, string target)
-    {
-        return (source == "zh" && target == "en") || (source == "en" && target == "zh");
-    }
-
     private static string NormalizeLang(string lang)
     {
         if (string.IsNullOrWhiteSpace(lang))
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""Model-free micro-benchmarks for the offline translator orchestration.
+
+Runs `translate_once.py` code paths against temporary directory fixtures and the
+built-in `fake` engine, so it works on any machine without argostranslate,
+ctranslate2 or model packages installed.
+
+    python bench_translate_once.py                 # run everything
+    python bench_translate_once.py -k self_heal    # only matching benchmarks
+    python bench_translate_once.py --json out.json # also write machine-readable results
+    python bench_translate_once.py --compare baseline.json --max-regression 25%
+                                                   # exit 1 if any benchmark got slower than allowed
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import pathlib
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import zipfile
+from typing import Callable
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent))
+
+import translate_once  # noqa: E402
+
+RUNTIME_MODULES = ("argostranslate", "ctranslate2", "sentencepiece", "numpy", "yaml", "packaging")
+PACKAGE_NAMES = ("translate-zh_en-1_9", "translate-en_zh-1_9") + tuple(
+    f"translate-{a}_{b}-1_9" for a, b in (("de", "en"), ("en", "de"), ("ja", "en"), ("en", "ja"), ("ko", "en"), ("en", "ko"))
+)
+SAMPLE_TEXT = "按三连空格把这段中文翻译成英文，然后再按三连空格切回原文。" * 4
+# Fastest round is the least noisy statistic for these short, I/O-bound timings.
+COMPARE_METRIC = "min_us"
+
+
+def bench(name: str, fn: Callable[[], object], *, setup: Callable[[], object] | None = None, min_time: float = 0.3, max_rounds: int = 2000) -> dict:
+    samples: list[int] = []
+    started = time.perf_counter()
+    while len(samples) < max_rounds and (len(samples) < 5 or time.perf_counter() - started < min_time):
+        if setup is not None:
+            setup()
+        t0 = time.perf_counter_ns()
+        fn()
+        samples.append(time.perf_counter_ns() - t0)
+    return {
+        "name": name,
+        "rounds": len(samples),
+        "min_us": min(samples) / 1000,
+        "median_us": statistics.median(samples) / 1000,
+        "mean_us": statistics.fmean(samples) / 1000,
+    }
+
+
+@contextlib.contextmanager
+def patched_env(**values: str):
+    previous = {key: os.environ.get(key) for key in values}
+    os.environ.update(values)
+    try:
+        yield
+    finally:
+        for key, value in previous.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+@contextlib.contextmanager
+def isolated_imports():
+    # Self-heal rewrites sys.path and imports stub runtime modules; undo both after each round.
+    saved_path = list(sys.path)
+    try:
+        yield
+    finally:
+        sys.path[:] = saved_path
+        translate_once._clear_import_cache()
+        for name in list(sys.modules):
+            if name.split(".", 1)[0] in RUNTIME_MODULES:
+                sys.modules.pop(name, None)
+
+
+def write_stub_modules(root: pathlib.Path, names: tuple[str, ...] = RUNTIME_MODULES) -> None:
+    for name in names:
+        pkg = root / name
+        pkg.mkdir(parents=True, exist_ok=True)
+        (pkg / "__init__.py").write_text("", encoding="utf-8")
+    if "argostranslate" in names:
+        (root / "argostranslate" / "translate.py").write_text("", encoding="utf-8")
+
+
+def zip_tree(source: pathlib.Path, archive: pathlib.Path) -> None:
+    archive.parent.mkdir(parents=True, exist_ok=True)
+    with zipfile.ZipFile(archive, "w") as zf:
+        for path in sorted(source.rglob("*")):
+            zf.write(path, path.relative_to(source).as_posix())
+
+
+def make_package_dir(root: pathlib.Path) -> pathlib.Path:
+    packages = translate_once._argos_packages_dir(root)
+    for name in PACKAGE_NAMES:
+        pkg = packages / name
+        (pkg / "model").mkdir(parents=True, exist_ok=True)
+        (pkg / "metadata.json").write_text("{}", encoding="utf-8")
+        (pkg / "model" / "model.bin").write_bytes(b"\0" * 4096)
+    return packages
+
+
+def bench_normalize_lang() -> list[dict]:
+    codes = ["zh-Hans", "zh_CN", "en-US", "EN", "ja-JP", "de", "", "  ko-KR  "]
+
+    def run() -> None:
+        for code in codes:
+            translate_once.normalize_lang(code)
+
+    return [bench("normalize_lang[8 codes]", run)]
+
+
+def bench_package_checks(tmp: pathlib.Path) -> list[dict]:
+    packages = make_package_dir(tmp / "pkg-home")
+    missing = tmp / "missing" / "packages"
+    graph = translate_once.discover_packages(packages)
+    return [
+        bench("has_required_packages[present]", lambda: translate_once._has_required_packages(packages)),
+        bench("has_required_packages[missing]", lambda: translate_once._has_required_packages(missing)),
+        bench("discover_packages[8 packages]", lambda: translate_once.discover_packages(packages)),
+        bench("plan_route[ja->de via en]", lambda: translate_once.plan_route(graph, "ja", "de")),
+    ]
+
+
+def bench_seed_home(tmp: pathlib.Path) -> list[dict]:
+    seed = tmp / "seed"
+    make_package_dir(seed)
+    (seed / ".config" / "argos-translate").mkdir(parents=True, exist_ok=True)
+    (seed / ".config" / "argos-translate" / "settings.json").write_text("{}", encoding="utf-8")
+
+    warm_home = tmp / "home-warm"
+    make_package_dir(warm_home)
+    cold_home = tmp / "home-cold"
+
+    results = []
+    with patched_env(HOME=str(warm_home), USERPROFILE=str(warm_home), TST_OFFLINE_SEED_HOME=str(seed)):
+        results.append(bench("bootstrap_seed_home[already seeded]", translate_once.bootstrap_seed_home))
+    with patched_env(HOME=str(cold_home), USERPROFILE=str(cold_home), TST_OFFLINE_SEED_HOME=str(seed)):
+        results.append(
+            bench(
+                "bootstrap_seed_home[migrate]",
+                translate_once.bootstrap_seed_home,
+                setup=lambda: shutil.rmtree(cold_home, ignore_errors=True),
+                max_rounds=200,
+            )
+        )
+    return results
+
+
+def bench_self_heal(tmp: pathlib.Path) -> list[dict]:
+    staging = tmp / "stub-site"
+    write_stub_modules(staging)
+
+    runtimes: dict[str, pathlib.Path] = {}
+
+    bundled = tmp / "runtime-bundled"
+    write_stub_modules(bundled / "python" / "Lib" / "site-packages")
+    runtimes["bundled_copy"] = bundled
+
+    deep = tmp / "runtime-deep"
+    write_stub_modules(deep / "python" / "vendor", ("argostranslate",))
+    runtimes["deep_copy"] = deep
+
+    archive = tmp / "runtime-archive"
+    zip_tree(staging, archive / "offline-site-packages.zip")
+    runtimes["archive"] = archive
+
+    wheels = tmp / "runtime-wheels"
+    zip_tree(staging, wheels / "wheelhouse" / "tst_stub-1.0-py3-none-any.whl")
+    runtimes["wheelhouse"] = wheels
+
+    # The deep-copy branch only copies argostranslate; the rest must already be importable.
+    deep_extras = tmp / "deep-extras"
+    write_stub_modules(deep_extras, tuple(name for name in RUNTIME_MODULES if name != "argostranslate"))
+
+    results = []
+    for branch, runtime_root in runtimes.items():
+        site_root = tmp / f"user-site-{branch}"
+
+        def run() -> None:
+            with isolated_imports():
+                # Force the initial import probe to fail even if a real argostranslate is installed.
+                sys.modules["argostranslate"] = None  # type: ignore[assignment]
+                if branch == "deep_copy":
+                    sys.path.insert(0, str(deep_extras))
+                translate_once.ensure_argostranslate_available()
+
+        def forget_previous_heal() -> None:
+            for marker in site_root.rglob(translate_once.SELF_HEAL_COMPLETE_MARKER):
+                marker.unlink()
+
+        with patched_env(
+            HOME=str(site_root),
+            USERPROFILE=str(site_root),
+            TST_OFFLINE_RUNTIME_ROOT=str(runtime_root),
+            TST_OFFLINE_ALT_USER_SITE_ROOT=str(site_root),
+            TST_OFFLINE_USER_SITE=str(site_root / "primary"),
+        ):
+            results.append(bench(f"ensure_argostranslate_available[{branch}]", run, setup=forget_previous_heal, max_rounds=200))
+            if branch == "bundled_copy":
+                # Second process after a finished heal: takes the lock and reuses the healed site.
+                results.append(bench("ensure_argostranslate_available[reuse healed site]", run))
+    return results
+
+
+def bench_glossary(tmp: pathlib.Path) -> list[dict]:
+    tmp.mkdir(parents=True, exist_ok=True)
+    glossary = tmp / "glossary.tsv"
+    lines = ["zh\ten\t三连空格\tTriple Space", "zh\ten\t中文\tChinese", "zh\ten\t英文\tEnglish"]
+    lines += [f"zh\ten\t术语{i}\tTerm {i}" for i in range(2000)]
+    glossary.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    cache_dir = tmp / "glossary-cache"
+
+    def reset_process_cache() -> None:
+        translate_once._glossary_by_pair.clear()
+
+    def cold() -> None:
+        reset_process_cache()
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    results = []
+    with patched_env(TST_OFFLINE_GLOSSARY=str(glossary), TST_OFFLINE_CACHE_DIR=str(cache_dir)):
+        results.append(bench("load_glossary[build+dump 2k terms]", lambda: translate_once.load_glossary("zh", "en"), setup=cold, max_rounds=100))
+        translate_once.load_glossary("zh", "en")
+        results.append(bench("load_glossary[binary cache]", lambda: translate_once.load_glossary("zh", "en"), setup=reset_process_cache))
+        results.append(bench("apply_glossary[sample]", lambda: translate_once.apply_glossary(SAMPLE_TEXT, "zh", "en")))
+    reset_process_cache()
+    return results
+
+
+def bench_main_fake_engine(tmp: pathlib.Path) -> list[dict]:
+    bulk_text = "\n".join([SAMPLE_TEXT] * 64)
+
+    def run(text: str, priority: str) -> None:
+        saved = sys.stdin, sys.stdout
+        sys.stdin, sys.stdout = io.StringIO(text), io.StringIO()
+        try:
+            translate_once.main(["--source", "zh", "--target", "en", "--engine", "fake", "--priority", priority])
+        finally:
+            sys.stdin, sys.stdout = saved
+
+    # Bulk runs would renice this benchmark process for good; only the orchestration cost is measured here.
+    saved_lower_priority = translate_once._lower_process_priority
+    translate_once._lower_process_priority = lambda: None
+    try:
+        with patched_env(
+            TST_OFFLINE_GLOSSARY="",
+            TST_OFFLINE_FAKE_LATENCY_MS="0",
+            TST_OFFLINE_ALT_USER_SITE_ROOT=str(tmp),
+            ARGOS_INTRA_THREADS="1",
+            ARGOS_INTER_THREADS="1",
+        ):
+            return [
+                bench("main[fake engine, interactive]", lambda: run(SAMPLE_TEXT, "interactive")),
+                bench("main[fake engine, bulk 64 lines]", lambda: run(bulk_text, "bulk")),
+            ]
+    finally:
+        translate_once._lower_process_priority = saved_lower_priority
+
+
+def parse_percent(value: str) -> float:
+    try:
+        return float(value.strip().rstrip("%")) / 100
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a percentage like 25%, got {value!r}") from None
+
+
+def compare_to_baseline(results: list[dict], baseline_path: pathlib.Path, max_regression: float) -> list[str]:
+    baseline = {entry["name"]: entry for entry in json.loads(baseline_path.read_text(encoding="utf-8"))}
+    regressions = []
+    for r in results:
+        previous = baseline.get(r["name"], {}).get(COMPARE_METRIC)
+        if not previous:
+            r["change"] = None
+            continue
+        r["change"] = r[COMPARE_METRIC] / previous - 1
+        if r["change"] > max_regression:
+            regressions.append(f"{r['name']}: {previous:.1f} us -> {r[COMPARE_METRIC]:.1f} us ({r['change']:+.0%})")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark translate_once.py orchestration without models")
+    parser.add_argument("-k", dest="keyword", default="", help="only report benchmarks whose name contains this text")
+    parser.add_argument("--json", dest="json_path", default="", help="write results to this JSON file")
+    parser.add_argument("--compare", dest="baseline_path", default="", help="baseline JSON written by an earlier --json run")
+    parser.add_argument(
+        "--max-regression",
+        type=parse_percent,
+        default=parse_percent("25%"),
+        help=f"allowed slowdown of {COMPARE_METRIC} against --compare before exiting non-zero (default: 25%%)",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="tst-bench-") as tmp_text:
+        tmp = pathlib.Path(tmp_text)
+        suites: list[Callable[[], list[dict]]] = [
+            bench_normalize_lang,
+            lambda: bench_package_checks(tmp / "checks"),
+            lambda: bench_seed_home(tmp / "seed"),
+            lambda: bench_self_heal(tmp / "heal"),
+            lambda: bench_glossary(tmp / "glossary"),
+            lambda: bench_main_fake_engine(tmp / "main"),
+        ]
+        results: list[dict] = []
+        for suite in suites:
+            results.extend(r for r in suite() if args.keyword in r["name"])
+
+    regressions = compare_to_baseline(results, pathlib.Path(args.baseline_path), args.max_regression) if args.baseline_path else []
+
+    width = max((len(r["name"]) for r in results), default=10)
+    header = f"{'benchmark':<{width}}  {'rounds':>6}  {'min us':>10}  {'median us':>10}  {'mean us':>10}"
+    print(header + (f"  {'vs base':>8}" if args.baseline_path else ""))
+    for r in results:
+        line = f"{r['name']:<{width}}  {r['rounds']:>6}  {r['min_us']:>10.1f}  {r['median_us']:>10.1f}  {r['mean_us']:>10.1f}"
+        if args.baseline_path:
+            line += f"  {'new' if r['change'] is None else format(r['change'], '+.0%'):>8}"
+        print(line)
+
+    if args.json_path:
+        pathlib.Path(args.json_path).write_text(
+            json.dumps([{k: v for k, v in r.items() if k != "change"} for r in results], indent=2), encoding="utf-8"
+        )
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) regressed by more than {args.max_regression:.0%}:", file=sys.stderr)
+        for line in regressions:
+            print(f"  {line}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())